@@ -23,6 +23,7 @@ THE SOFTWARE.
 
 """
 
+from collections import deque
 import itertools
 import logging
 import struct
@@ -34,8 +35,7 @@ import pytest
 import cocotb_test.simulator
 
 import cocotb
-from cocotb.clock import Clock
-from cocotb.triggers import RisingEdge
+from cocotb.triggers import RisingEdge, ClockCycles, Timer
 from cocotb.utils import get_time_from_sim_steps
 from cocotb.regression import TestFactory
 
@@ -50,20 +50,136 @@ PtpTsBus, PtpTsTransaction, PtpTsSource, PtpTsSink, PtpTsMonitor = define_stream
 )
 
 
+# PTP timestamps carry 16 fractional nanosecond bits
+PTP_TS_SCALE = 1.0 / 2**16
+
+# incrementing byte pattern covering the largest test frame
+PAYLOAD_TEMPLATE = bytes(range(256)) * 8
+
+# signals driven to zero on testbench construction
+ZERO_INIT_SIGNALS = (
+    "tx_lfc_req",
+    "tx_lfc_resend",
+    "rx_lfc_en",
+    "rx_lfc_ack",
+    "tx_pfc_req",
+    "tx_pfc_resend",
+    "rx_pfc_en",
+    "rx_pfc_ack",
+    "tx_lfc_pause_en",
+    "tx_pause_req",
+    "rx_mii_select",
+    "tx_mii_select",
+    "ifg_delay",
+    "cfg_mcf_rx_eth_dst_mcast",
+    "cfg_mcf_rx_check_eth_dst_mcast",
+    "cfg_mcf_rx_eth_dst_ucast",
+    "cfg_mcf_rx_check_eth_dst_ucast",
+    "cfg_mcf_rx_eth_src",
+    "cfg_mcf_rx_check_eth_src",
+    "cfg_mcf_rx_eth_type",
+    "cfg_mcf_rx_opcode_lfc",
+    "cfg_mcf_rx_check_opcode_lfc",
+    "cfg_mcf_rx_opcode_pfc",
+    "cfg_mcf_rx_check_opcode_pfc",
+    "cfg_mcf_rx_forward",
+    "cfg_mcf_rx_enable",
+    "cfg_tx_lfc_eth_dst",
+    "cfg_tx_lfc_eth_src",
+    "cfg_tx_lfc_eth_type",
+    "cfg_tx_lfc_opcode",
+    "cfg_tx_lfc_en",
+    "cfg_tx_lfc_quanta",
+    "cfg_tx_lfc_refresh",
+    "cfg_tx_pfc_eth_dst",
+    "cfg_tx_pfc_eth_src",
+    "cfg_tx_pfc_eth_type",
+    "cfg_tx_pfc_opcode",
+    "cfg_tx_pfc_en",
+    "cfg_tx_pfc_quanta",
+    "cfg_tx_pfc_refresh",
+    "cfg_rx_lfc_opcode",
+    "cfg_rx_lfc_en",
+    "cfg_rx_pfc_opcode",
+    "cfg_rx_pfc_en",
+)
+
+# MAC control frame RX configuration shared by LFC and PFC tests
+MCF_RX_CONFIG = (
+    ("cfg_mcf_rx_eth_dst_mcast", 0x0180C2000001),
+    ("cfg_mcf_rx_check_eth_dst_mcast", 1),
+    ("cfg_mcf_rx_eth_dst_ucast", 0xDAD1D2D3D4D5),
+    ("cfg_mcf_rx_check_eth_dst_ucast", 0),
+    ("cfg_mcf_rx_eth_src", 0x5A5152535455),
+    ("cfg_mcf_rx_check_eth_src", 0),
+    ("cfg_mcf_rx_eth_type", 0x8808),
+    ("cfg_mcf_rx_opcode_lfc", 0x0001),
+    ("cfg_mcf_rx_check_opcode_lfc", 1),
+    ("cfg_mcf_rx_opcode_pfc", 0x0101),
+    ("cfg_mcf_rx_check_opcode_pfc", 1),
+    ("cfg_mcf_rx_forward", 0),
+    ("cfg_mcf_rx_enable", 1),
+)
+
+# DUT configuration for link-level flow control tests
+LFC_CONFIG = (
+    ("tx_lfc_req", 0),
+    ("tx_lfc_resend", 0),
+    ("rx_lfc_en", 1),
+    ("rx_lfc_ack", 0),
+    ("tx_lfc_pause_en", 1),
+    ("tx_pause_req", 0),
+    ("cfg_tx_lfc_eth_dst", 0x0180C2000001),
+    ("cfg_tx_lfc_eth_src", 0x5A5152535455),
+    ("cfg_tx_lfc_eth_type", 0x8808),
+    ("cfg_tx_lfc_opcode", 0x0001),
+    ("cfg_tx_lfc_en", 1),
+    ("cfg_tx_lfc_quanta", 0xFFFF),
+    ("cfg_tx_lfc_refresh", 0x7F00),
+    ("cfg_rx_lfc_opcode", 0x0001),
+    ("cfg_rx_lfc_en", 1),
+)
+
+# DUT configuration for priority flow control tests
+PFC_CONFIG = (
+    ("tx_pfc_req", 0x00),
+    ("tx_pfc_resend", 0),
+    ("rx_pfc_en", 0xff),
+    ("rx_pfc_ack", 0),
+    ("tx_lfc_pause_en", 0),
+    ("tx_pause_req", 0),
+    ("cfg_tx_pfc_eth_dst", 0x0180C2000001),
+    ("cfg_tx_pfc_eth_src", 0x5A5152535455),
+    ("cfg_tx_pfc_eth_type", 0x8808),
+    ("cfg_tx_pfc_opcode", 0x0101),
+    ("cfg_tx_pfc_en", 1),
+    ("cfg_tx_pfc_quanta", 0xFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFF),
+    ("cfg_tx_pfc_refresh", 0x7F007F007F007F007F007F007F007F00),
+    ("cfg_rx_pfc_opcode", 0x0101),
+    ("cfg_rx_pfc_en", 1),
+)
+
+# pause frames injected on the GMII side of the LFC/PFC tests
+LFC_PAUSE_FRAME = bytes(Ether(src='DA:D1:D2:D3:D4:D5', dst='01:80:C2:00:00:01', type=0x8808) /
+    struct.pack('!HH', 0x0001, 100))
+PFC_PAUSE_FRAME = bytes(Ether(src='DA:D1:D2:D3:D4:D5', dst='01:80:C2:00:00:01', type=0x8808) /
+    struct.pack('!HH8H', 0x0101, 0x00FF, 10, 20, 30, 40, 50, 60, 70, 80))
+
+
 class TB:
     def __init__(self, dut):
         self.dut = dut
 
         self.log = logging.getLogger("cocotb.tb")
-        self.log.setLevel(logging.DEBUG)
+        self.log.setLevel(logging.INFO)
 
         self._enable_generator_rx = None
         self._enable_generator_tx = None
         self._enable_cr_rx = None
         self._enable_cr_tx = None
 
-        cocotb.start_soon(Clock(dut.rx_clk, 8, units="ns").start())
-        cocotb.start_soon(Clock(dut.tx_clk, 8, units="ns").start())
+        # RX and TX clocks share period and phase, so drive both from one coroutine
+        cocotb.start_soon(self._run_clocks(8, units="ns"))
 
         self.gmii_source = GmiiSource(dut.gmii_rxd, dut.gmii_rx_er, dut.gmii_rx_dv,
             dut.rx_clk, dut.rx_rst, dut.rx_clk_enable, dut.rx_mii_select)
@@ -77,56 +193,11 @@ class TB:
         self.tx_ptp_clock = PtpClockSimTime(ts_64=dut.tx_ptp_ts, clock=dut.tx_clk)
         self.tx_ptp_ts_sink = PtpTsSink(PtpTsBus.from_prefix(dut, "tx_axis_ptp"), dut.tx_clk, dut.tx_rst)
 
-        dut.tx_lfc_req.setimmediatevalue(0)
-        dut.tx_lfc_resend.setimmediatevalue(0)
-        dut.rx_lfc_en.setimmediatevalue(0)
-        dut.rx_lfc_ack.setimmediatevalue(0)
-
-        dut.tx_pfc_req.setimmediatevalue(0)
-        dut.tx_pfc_resend.setimmediatevalue(0)
-        dut.rx_pfc_en.setimmediatevalue(0)
-        dut.rx_pfc_ack.setimmediatevalue(0)
-
-        dut.tx_lfc_pause_en.setimmediatevalue(0)
-        dut.tx_pause_req.setimmediatevalue(0)
+        for name in ZERO_INIT_SIGNALS:
+            getattr(dut, name).setimmediatevalue(0)
 
         dut.rx_clk_enable.setimmediatevalue(1)
         dut.tx_clk_enable.setimmediatevalue(1)
-        dut.rx_mii_select.setimmediatevalue(0)
-        dut.tx_mii_select.setimmediatevalue(0)
-
-        dut.ifg_delay.setimmediatevalue(0)
-        dut.cfg_mcf_rx_eth_dst_mcast.setimmediatevalue(0)
-        dut.cfg_mcf_rx_check_eth_dst_mcast.setimmediatevalue(0)
-        dut.cfg_mcf_rx_eth_dst_ucast.setimmediatevalue(0)
-        dut.cfg_mcf_rx_check_eth_dst_ucast.setimmediatevalue(0)
-        dut.cfg_mcf_rx_eth_src.setimmediatevalue(0)
-        dut.cfg_mcf_rx_check_eth_src.setimmediatevalue(0)
-        dut.cfg_mcf_rx_eth_type.setimmediatevalue(0)
-        dut.cfg_mcf_rx_opcode_lfc.setimmediatevalue(0)
-        dut.cfg_mcf_rx_check_opcode_lfc.setimmediatevalue(0)
-        dut.cfg_mcf_rx_opcode_pfc.setimmediatevalue(0)
-        dut.cfg_mcf_rx_check_opcode_pfc.setimmediatevalue(0)
-        dut.cfg_mcf_rx_forward.setimmediatevalue(0)
-        dut.cfg_mcf_rx_enable.setimmediatevalue(0)
-        dut.cfg_tx_lfc_eth_dst.setimmediatevalue(0)
-        dut.cfg_tx_lfc_eth_src.setimmediatevalue(0)
-        dut.cfg_tx_lfc_eth_type.setimmediatevalue(0)
-        dut.cfg_tx_lfc_opcode.setimmediatevalue(0)
-        dut.cfg_tx_lfc_en.setimmediatevalue(0)
-        dut.cfg_tx_lfc_quanta.setimmediatevalue(0)
-        dut.cfg_tx_lfc_refresh.setimmediatevalue(0)
-        dut.cfg_tx_pfc_eth_dst.setimmediatevalue(0)
-        dut.cfg_tx_pfc_eth_src.setimmediatevalue(0)
-        dut.cfg_tx_pfc_eth_type.setimmediatevalue(0)
-        dut.cfg_tx_pfc_opcode.setimmediatevalue(0)
-        dut.cfg_tx_pfc_en.setimmediatevalue(0)
-        dut.cfg_tx_pfc_quanta.setimmediatevalue(0)
-        dut.cfg_tx_pfc_refresh.setimmediatevalue(0)
-        dut.cfg_rx_lfc_opcode.setimmediatevalue(0)
-        dut.cfg_rx_lfc_en.setimmediatevalue(0)
-        dut.cfg_rx_pfc_opcode.setimmediatevalue(0)
-        dut.cfg_rx_pfc_en.setimmediatevalue(0)
 
     async def reset(self):
         self.dut.rx_rst.setimmediatevalue(0)
@@ -168,15 +239,34 @@ class TB:
     def clear_enable_generator_tx(self):
         self.set_enable_generator_tx(None)
 
+    async def _run_clocks(self, period, units="step"):
+        rx_clk = self.dut.rx_clk
+        tx_clk = self.dut.tx_clk
+        half_period = Timer(period / 2, units=units)
+
+        while True:
+            rx_clk.value = 1
+            tx_clk.value = 1
+            await half_period
+            rx_clk.value = 0
+            tx_clk.value = 0
+            await half_period
+
     async def _run_enable_rx(self):
+        clk_enable = self.dut.rx_clk_enable
+        clock_edge_event = RisingEdge(self.dut.rx_clk)
+
         for val in self._enable_generator_rx:
-            self.dut.rx_clk_enable.value = val
-            await RisingEdge(self.dut.rx_clk)
+            clk_enable.value = val
+            await clock_edge_event
 
     async def _run_enable_tx(self):
+        clk_enable = self.dut.tx_clk_enable
+        clock_edge_event = RisingEdge(self.dut.tx_clk)
+
         for val in self._enable_generator_tx:
-            self.dut.tx_clk_enable.value = val
-            await RisingEdge(self.dut.tx_clk)
+            clk_enable.value = val
+            await clock_edge_event
 
 
 async def run_test_rx(dut, payload_lengths=None, payload_data=None, ifg=12, enable_gen=None, mii_sel=False):
@@ -195,25 +285,27 @@ async def run_test_rx(dut, payload_lengths=None, payload_data=None, ifg=12, enab
     await tb.reset()
 
     test_frames = [payload_data(x) for x in payload_lengths()]
-    tx_frames = []
+    tx_frames = deque()
 
-    for test_data in test_frames:
-        test_frame = GmiiFrame.from_payload(test_data, tx_complete=tx_frames.append)
+    gmii_frames = [GmiiFrame.from_payload(test_data, tx_complete=tx_frames.append) for test_data in test_frames]
+
+    for test_frame in gmii_frames:
         await tb.gmii_source.send(test_frame)
 
     for test_data in test_frames:
         rx_frame = await tb.axis_sink.recv()
-        tx_frame = tx_frames.pop(0)
+        tx_frame = tx_frames.popleft()
 
         frame_error = rx_frame.tuser & 1
         ptp_ts = rx_frame.tuser >> 1
-        ptp_ts_ns = ptp_ts / 2**16
+        ptp_ts_ns = ptp_ts * PTP_TS_SCALE
 
         tx_frame_sfd_ns = get_time_from_sim_steps(tx_frame.sim_time_sfd, "ns")
 
-        tb.log.info("RX frame PTP TS: %f ns", ptp_ts_ns)
-        tb.log.info("TX frame SFD sim time: %f ns", tx_frame_sfd_ns)
-        tb.log.info("Difference: %f ns", abs(ptp_ts_ns - tx_frame_sfd_ns))
+        if tb.log.isEnabledFor(logging.DEBUG):
+            tb.log.debug("RX frame PTP TS: %f ns", ptp_ts_ns)
+            tb.log.debug("TX frame SFD sim time: %f ns", tx_frame_sfd_ns)
+            tb.log.debug("Difference: %f ns", abs(ptp_ts_ns - tx_frame_sfd_ns))
 
         assert rx_frame.tdata == test_data
         assert frame_error == 0
@@ -242,20 +334,23 @@ async def run_test_tx(dut, payload_lengths=None, payload_data=None, ifg=12, enab
 
     test_frames = [payload_data(x) for x in payload_lengths()]
 
-    for test_data in test_frames:
-        await tb.axis_source.send(AxiStreamFrame(test_data, tuser=2))
+    axis_frames = [AxiStreamFrame(test_data, tuser=2) for test_data in test_frames]
+
+    for test_frame in axis_frames:
+        await tb.axis_source.send(test_frame)
 
     for test_data in test_frames:
         rx_frame = await tb.gmii_sink.recv()
         ptp_ts = await tb.tx_ptp_ts_sink.recv()
 
-        ptp_ts_ns = int(ptp_ts.ts) / 2**16
+        ptp_ts_ns = int(ptp_ts.ts) * PTP_TS_SCALE
 
         rx_frame_sfd_ns = get_time_from_sim_steps(rx_frame.sim_time_sfd, "ns")
 
-        tb.log.info("TX frame PTP TS: %f ns", ptp_ts_ns)
-        tb.log.info("RX frame SFD sim time: %f ns", rx_frame_sfd_ns)
-        tb.log.info("Difference: %f ns", abs(rx_frame_sfd_ns - ptp_ts_ns))
+        if tb.log.isEnabledFor(logging.DEBUG):
+            tb.log.debug("TX frame PTP TS: %f ns", ptp_ts_ns)
+            tb.log.debug("RX frame SFD sim time: %f ns", rx_frame_sfd_ns)
+            tb.log.debug("Difference: %f ns", abs(rx_frame_sfd_ns - ptp_ts_ns))
 
         assert rx_frame.get_payload() == test_data
         assert rx_frame.check_fcs()
@@ -283,110 +378,77 @@ async def run_test_lfc(dut, ifg=12, enable_gen=None, mii_sel=True):
 
     await tb.reset()
 
-    dut.tx_lfc_req.value = 0
-    dut.tx_lfc_resend.value = 0
-    dut.rx_lfc_en.value = 1
-    dut.rx_lfc_ack.value = 0
-
-    dut.tx_lfc_pause_en.value = 1
-    dut.tx_pause_req.value = 0
-
-    dut.cfg_mcf_rx_eth_dst_mcast.value = 0x0180C2000001
-    dut.cfg_mcf_rx_check_eth_dst_mcast.value = 1
-    dut.cfg_mcf_rx_eth_dst_ucast.value = 0xDAD1D2D3D4D5
-    dut.cfg_mcf_rx_check_eth_dst_ucast.value = 0
-    dut.cfg_mcf_rx_eth_src.value = 0x5A5152535455
-    dut.cfg_mcf_rx_check_eth_src.value = 0
-    dut.cfg_mcf_rx_eth_type.value = 0x8808
-    dut.cfg_mcf_rx_opcode_lfc.value = 0x0001
-    dut.cfg_mcf_rx_check_opcode_lfc.value = 1
-    dut.cfg_mcf_rx_opcode_pfc.value = 0x0101
-    dut.cfg_mcf_rx_check_opcode_pfc.value = 1
-
-    dut.cfg_mcf_rx_forward.value = 0
-    dut.cfg_mcf_rx_enable.value = 1
-
-    dut.cfg_tx_lfc_eth_dst.value = 0x0180C2000001
-    dut.cfg_tx_lfc_eth_src.value = 0x5A5152535455
-    dut.cfg_tx_lfc_eth_type.value = 0x8808
-    dut.cfg_tx_lfc_opcode.value = 0x0001
-    dut.cfg_tx_lfc_en.value = 1
-    dut.cfg_tx_lfc_quanta.value = 0xFFFF
-    dut.cfg_tx_lfc_refresh.value = 0x7F00
-
-    dut.cfg_rx_lfc_opcode.value = 0x0001
-    dut.cfg_rx_lfc_en.value = 1
-
-    test_tx_pkts = []
-    test_rx_pkts = []
+    for name, val in MCF_RX_CONFIG + LFC_CONFIG:
+        getattr(dut, name).value = val
 
-    for k in range(32):
-        length = 128
-        payload = bytearray(itertools.islice(itertools.cycle(range(256)), length))
+    test_tx_pkts = deque()
+    test_rx_pkts = deque()
+
+    length = 128
+    payload = incrementing_payload(length)
 
-        eth = Ether(src='5A:51:52:53:54:55', dst='DA:D1:D2:D3:D4:D5', type=0x8000)
-        test_pkt = eth / payload
-        test_tx_pkts.append(test_pkt.copy())
+    tx_hdr = bytes(Ether(src='5A:51:52:53:54:55', dst='DA:D1:D2:D3:D4:D5', type=0x8000))
+    # same header with source and destination swapped
+    rx_hdr = tx_hdr[6:12] + tx_hdr[0:6] + tx_hdr[12:14]
 
-        await tb.axis_source.send(bytes(test_pkt))
+    tx_data_pkt = tx_hdr + payload
+    rx_data_pkt = rx_hdr + payload
 
-        eth = Ether(src='DA:D1:D2:D3:D4:D5', dst='5A:51:52:53:54:55', type=0x8000)
-        test_pkt = eth / payload
-        test_rx_pkts.append(test_pkt.copy())
+    for k in range(32):
+        test_tx_pkts.append(tx_data_pkt)
+
+        await tb.axis_source.send(tx_data_pkt)
+
+        test_rx_pkts.append(rx_data_pkt)
 
-        test_frame = GmiiFrame.from_payload(bytes(test_pkt))
+        test_frame = GmiiFrame.from_payload(rx_data_pkt)
         await tb.gmii_source.send(test_frame)
 
         if k == 16:
-            eth = Ether(src='DA:D1:D2:D3:D4:D5', dst='01:80:C2:00:00:01', type=0x8808)
-            test_pkt = eth / struct.pack('!HH', 0x0001, 100)
-            test_rx_pkts.append(test_pkt.copy())
+            test_rx_pkts.append(LFC_PAUSE_FRAME)
 
-            test_frame = GmiiFrame.from_payload(bytes(test_pkt))
+            test_frame = GmiiFrame.from_payload(LFC_PAUSE_FRAME)
             await tb.gmii_source.send(test_frame)
 
-    for k in range(1000):
-        await RisingEdge(dut.tx_clk)
+    await ClockCycles(dut.tx_clk, 1000)
 
     dut.tx_lfc_req.value = 1
 
-    for k in range(1000):
-        await RisingEdge(dut.tx_clk)
+    await ClockCycles(dut.tx_clk, 1000)
 
     dut.tx_lfc_req.value = 0
 
     while not dut.rx_lfc_req.value.integer:
         await RisingEdge(dut.tx_clk)
 
-    for k in range(1000):
-        await RisingEdge(dut.tx_clk)
+    await ClockCycles(dut.tx_clk, 1000)
 
     dut.tx_lfc_req.value = 1
 
-    for k in range(1000):
-        await RisingEdge(dut.tx_clk)
+    await ClockCycles(dut.tx_clk, 1000)
 
     dut.tx_lfc_req.value = 0
 
     while test_rx_pkts:
         rx_frame = await tb.axis_sink.recv()
 
-        rx_pkt = Ether(bytes(rx_frame))
+        rx_pkt = bytes(rx_frame)
 
-        tb.log.info("RX packet: %s", repr(rx_pkt))
+        if tb.log.isEnabledFor(logging.DEBUG):
+            tb.log.debug("RX packet: %s", repr(Ether(rx_pkt)))
 
-        if rx_pkt.type == 0x8808:
-            test_pkt = test_rx_pkts.pop(0)
+        if int.from_bytes(rx_pkt[12:14], 'big') == 0x8808:
+            test_pkt = test_rx_pkts.popleft()
             # check prefix as frame gets zero-padded
-            assert bytes(rx_pkt).find(bytes(test_pkt)) == 0
+            assert rx_pkt.startswith(test_pkt)
             if isinstance(rx_frame.tuser, list):
                 assert rx_frame.tuser[-1] & 1
             else:
                 assert rx_frame.tuser & 1
         else:
-            test_pkt = test_rx_pkts.pop(0)
+            test_pkt = test_rx_pkts.popleft()
             # check prefix as frame gets zero-padded
-            assert bytes(rx_pkt).find(bytes(test_pkt)) == 0
+            assert rx_pkt.startswith(test_pkt)
             if isinstance(rx_frame.tuser, list):
                 assert not rx_frame.tuser[-1] & 1
             else:
@@ -397,16 +459,17 @@ async def run_test_lfc(dut, ifg=12, enable_gen=None, mii_sel=True):
     while test_tx_pkts:
         tx_frame = await tb.gmii_sink.recv()
 
-        tx_pkt = Ether(bytes(tx_frame.get_payload()))
+        tx_pkt = bytes(tx_frame.get_payload())
 
-        tb.log.info("TX packet: %s", repr(tx_pkt))
+        if tb.log.isEnabledFor(logging.DEBUG):
+            tb.log.debug("TX packet: %s", repr(Ether(tx_pkt)))
 
-        if tx_pkt.type == 0x8808:
+        if int.from_bytes(tx_pkt[12:14], 'big') == 0x8808:
             tx_lfc_cnt += 1
         else:
-            test_pkt = test_tx_pkts.pop(0)
+            test_pkt = test_tx_pkts.popleft()
             # check prefix as frame gets zero-padded
-            assert bytes(tx_pkt).find(bytes(test_pkt)) == 0
+            assert tx_pkt.startswith(test_pkt)
 
     assert tx_lfc_cnt == 4
 
@@ -432,98 +495,67 @@ async def run_test_pfc(dut, ifg=12, enable_gen=None, mii_sel=True):
 
     await tb.reset()
 
-    dut.tx_pfc_req.value = 0x00
-    dut.tx_pfc_resend.value = 0
-    dut.rx_pfc_en.value = 0xff
-    dut.rx_pfc_ack.value = 0
-
-    dut.tx_lfc_pause_en.value = 0
-    dut.tx_pause_req.value = 0
-
-    dut.cfg_mcf_rx_eth_dst_mcast.value = 0x0180C2000001
-    dut.cfg_mcf_rx_check_eth_dst_mcast.value = 1
-    dut.cfg_mcf_rx_eth_dst_ucast.value = 0xDAD1D2D3D4D5
-    dut.cfg_mcf_rx_check_eth_dst_ucast.value = 0
-    dut.cfg_mcf_rx_eth_src.value = 0x5A5152535455
-    dut.cfg_mcf_rx_check_eth_src.value = 0
-    dut.cfg_mcf_rx_eth_type.value = 0x8808
-    dut.cfg_mcf_rx_opcode_lfc.value = 0x0001
-    dut.cfg_mcf_rx_check_opcode_lfc.value = 1
-    dut.cfg_mcf_rx_opcode_pfc.value = 0x0101
-    dut.cfg_mcf_rx_check_opcode_pfc.value = 1
-
-    dut.cfg_mcf_rx_forward.value = 0
-    dut.cfg_mcf_rx_enable.value = 1
-
-    dut.cfg_tx_pfc_eth_dst.value = 0x0180C2000001
-    dut.cfg_tx_pfc_eth_src.value = 0x5A5152535455
-    dut.cfg_tx_pfc_eth_type.value = 0x8808
-    dut.cfg_tx_pfc_opcode.value = 0x0101
-    dut.cfg_tx_pfc_en.value = 1
-    dut.cfg_tx_pfc_quanta.value = 0xFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFF
-    dut.cfg_tx_pfc_refresh.value = 0x7F007F007F007F007F007F007F007F00
-
-    dut.cfg_rx_pfc_opcode.value = 0x0101
-    dut.cfg_rx_pfc_en.value = 1
-
-    test_tx_pkts = []
-    test_rx_pkts = []
+    for name, val in MCF_RX_CONFIG + PFC_CONFIG:
+        getattr(dut, name).value = val
 
-    for k in range(32):
-        length = 128
-        payload = bytearray(itertools.islice(itertools.cycle(range(256)), length))
+    test_tx_pkts = deque()
+    test_rx_pkts = deque()
 
-        eth = Ether(src='5A:51:52:53:54:55', dst='DA:D1:D2:D3:D4:D5', type=0x8000)
-        test_pkt = eth / payload
-        test_tx_pkts.append(test_pkt.copy())
+    length = 128
+    payload = incrementing_payload(length)
 
-        await tb.axis_source.send(bytes(test_pkt))
+    tx_hdr = bytes(Ether(src='5A:51:52:53:54:55', dst='DA:D1:D2:D3:D4:D5', type=0x8000))
+    # same header with source and destination swapped
+    rx_hdr = tx_hdr[6:12] + tx_hdr[0:6] + tx_hdr[12:14]
+
+    tx_data_pkt = tx_hdr + payload
+    rx_data_pkt = rx_hdr + payload
+
+    for k in range(32):
+        test_tx_pkts.append(tx_data_pkt)
 
-        eth = Ether(src='DA:D1:D2:D3:D4:D5', dst='5A:51:52:53:54:55', type=0x8000)
-        test_pkt = eth / payload
-        test_rx_pkts.append(test_pkt.copy())
+        await tb.axis_source.send(tx_data_pkt)
 
-        test_frame = GmiiFrame.from_payload(bytes(test_pkt))
+        test_rx_pkts.append(rx_data_pkt)
+
+        test_frame = GmiiFrame.from_payload(rx_data_pkt)
         await tb.gmii_source.send(test_frame)
 
         if k == 16:
-            eth = Ether(src='DA:D1:D2:D3:D4:D5', dst='01:80:C2:00:00:01', type=0x8808)
-            test_pkt = eth / struct.pack('!HH8H', 0x0101, 0x00FF, 10, 20, 30, 40, 50, 60, 70, 80)
-            test_rx_pkts.append(test_pkt.copy())
+            test_rx_pkts.append(PFC_PAUSE_FRAME)
 
-            test_frame = GmiiFrame.from_payload(bytes(test_pkt))
+            test_frame = GmiiFrame.from_payload(PFC_PAUSE_FRAME)
             await tb.gmii_source.send(test_frame)
 
     for i in range(8):
-        for k in range(500):
-            await RisingEdge(dut.tx_clk)
+        await ClockCycles(dut.tx_clk, 500)
 
         dut.tx_pfc_req.value = 0xff >> (7-i)
 
-    for k in range(500):
-        await RisingEdge(dut.tx_clk)
+    await ClockCycles(dut.tx_clk, 500)
 
     dut.tx_pfc_req.value = 0x00
 
     while test_rx_pkts:
         rx_frame = await tb.axis_sink.recv()
 
-        rx_pkt = Ether(bytes(rx_frame))
+        rx_pkt = bytes(rx_frame)
 
-        tb.log.info("RX packet: %s", repr(rx_pkt))
+        if tb.log.isEnabledFor(logging.DEBUG):
+            tb.log.debug("RX packet: %s", repr(Ether(rx_pkt)))
 
-        if rx_pkt.type == 0x8808:
-            test_pkt = test_rx_pkts.pop(0)
+        if int.from_bytes(rx_pkt[12:14], 'big') == 0x8808:
+            test_pkt = test_rx_pkts.popleft()
             # check prefix as frame gets zero-padded
-            assert bytes(rx_pkt).find(bytes(test_pkt)) == 0
+            assert rx_pkt.startswith(test_pkt)
             if isinstance(rx_frame.tuser, list):
                 assert rx_frame.tuser[-1] & 1
             else:
                 assert rx_frame.tuser & 1
         else:
-            test_pkt = test_rx_pkts.pop(0)
+            test_pkt = test_rx_pkts.popleft()
             # check prefix as frame gets zero-padded
-            assert bytes(rx_pkt).find(bytes(test_pkt)) == 0
+            assert rx_pkt.startswith(test_pkt)
             if isinstance(rx_frame.tuser, list):
                 assert not rx_frame.tuser[-1] & 1
             else:
@@ -534,16 +566,17 @@ async def run_test_pfc(dut, ifg=12, enable_gen=None, mii_sel=True):
     while test_tx_pkts:
         tx_frame = await tb.gmii_sink.recv()
 
-        tx_pkt = Ether(bytes(tx_frame.get_payload()))
+        tx_pkt = bytes(tx_frame.get_payload())
 
-        tb.log.info("TX packet: %s", repr(tx_pkt))
+        if tb.log.isEnabledFor(logging.DEBUG):
+            tb.log.debug("TX packet: %s", repr(Ether(tx_pkt)))
 
-        if tx_pkt.type == 0x8808:
+        if int.from_bytes(tx_pkt[12:14], 'big') == 0x8808:
             tx_pfc_cnt += 1
         else:
-            test_pkt = test_tx_pkts.pop(0)
+            test_pkt = test_tx_pkts.popleft()
             # check prefix as frame gets zero-padded
-            assert bytes(tx_pkt).find(bytes(test_pkt)) == 0
+            assert tx_pkt.startswith(test_pkt)
 
     assert tx_pfc_cnt > 2 and tx_pfc_cnt <= 9
 
@@ -558,25 +591,44 @@ def size_list():
     return list(range(60, 128)) + [512, 1514] + [60]*10
 
 
+def size_list_short():
+    return [60, 64, 65, 127, 128, 512, 1514]
+
+
 def incrementing_payload(length):
-    return bytearray(itertools.islice(itertools.cycle(range(256)), length))
+    assert length <= len(PAYLOAD_TEMPLATE)
+    return PAYLOAD_TEMPLATE[:length]
 
 
 def cycle_en():
     return itertools.cycle([0, 0, 0, 1])
 
 
+def env_flag(name):
+    return os.environ.get(name, "0").lower() not in ("", "0", "false", "no")
+
+
 if cocotb.SIM_NAME:
 
+    # set QUICK=1 to run a reduced frame size sweep
+    rx_tx_sizes = size_list_short if env_flag("QUICK") else size_list
+
+    # set FULL_MATRIX=1 to also run MII select with clock enable gating
+    rx_tx_matrix = [
+        ("", [None], [False, True]),
+        ("_clk_en", [cycle_en], [False, True] if env_flag("FULL_MATRIX") else [False]),
+    ]
+
     for test in [run_test_rx, run_test_tx]:
 
-        factory = TestFactory(test)
-        factory.add_option("payload_lengths", [size_list])
-        factory.add_option("payload_data", [incrementing_payload])
-        factory.add_option("ifg", [12])
-        factory.add_option("enable_gen", [None, cycle_en])
-        factory.add_option("mii_sel", [False, True])
-        factory.generate_tests()
+        for postfix, enable_gen, mii_sel in rx_tx_matrix:
+            factory = TestFactory(test)
+            factory.add_option("payload_lengths", [rx_tx_sizes])
+            factory.add_option("payload_data", [incrementing_payload])
+            factory.add_option("ifg", [12])
+            factory.add_option("enable_gen", enable_gen)
+            factory.add_option("mii_sel", mii_sel)
+            factory.generate_tests(postfix=postfix)
 
     if cocotb.top.PFC_ENABLE.value:
         for test in [run_test_lfc, run_test_pfc]: